@@ -5,6 +5,7 @@ from .partition import (
     WholeGeometryPartition,
     LinearGeometryPartition,
     ExplicitGeometryPartition,
+    warmup_partitions,
 )
 
 
@@ -112,3 +112,17 @@ class Geometry:
     def side_outer_cell_index(args: "Geometry.SideArg", side_index: ElementIndex):
         """Device function returning the outer cell index for a given side"""
         raise NotImplementedError
+
+    def side_cell_pair(args: "Geometry.SideArg", side_index: ElementIndex):
+        """Device function returning the inner and outer cell indices for a given side, as a ``vec2i``
+
+        Optional; if not defined, ``side_inner_cell_index`` and ``side_outer_cell_index`` are used instead.
+        """
+        raise NotImplementedError
+
+    def partition_side_indices_linear(self, cell_begin: int, cell_end: int, device):
+        """Optionally computes in closed form the partition, boundary and frontier side indices of a partition owning cells ``[cell_begin, cell_end)``.
+
+        Returns ``None`` if not supported by the geometry, in which case sides are classified by the generic partition kernel.
+        """
+        return None
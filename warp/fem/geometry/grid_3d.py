@@ -4,6 +4,7 @@ from warp.fem.types import ElementIndex, Coords, Sample, NULL_QP_INDEX, NULL_DOF
 from warp.fem.types import vec2i, vec3i
 
 from .geometry import Geometry
+from .grid_partition import _linear_grid_partition_side_counts, linear_grid_partition_side_indices
 from .element import Square, Cube
 
 
@@ -364,3 +365,82 @@ class Grid3D(Geometry):
 
         cell = Grid3D._local_to_world(side.axis, outer_origin)
         return Grid3D.cell_index(arg.cell_arg.res, cell)
+
+    @wp.func
+    def side_cell_pair(arg: SideArg, side_index: ElementIndex):
+        """Inner and outer cell indices for a given side, evaluated from a single side lookup"""
+        side = Grid3D.get_side(arg, side_index)
+
+        alt_axis = Grid3D.LOC_TO_WORLD[side.axis, 0]
+        inner_alt = wp.max(side.origin[0] - 1, 0)
+        outer_alt = wp.min(side.origin[0], arg.cell_arg.res[alt_axis] - 1)
+
+        inner_cell = Grid3D._local_to_world(side.axis, vec3i(inner_alt, side.origin[1], side.origin[2]))
+        outer_cell = Grid3D._local_to_world(side.axis, vec3i(outer_alt, side.origin[1], side.origin[2]))
+
+        return vec2i(
+            Grid3D.cell_index(arg.cell_arg.res, inner_cell),
+            Grid3D.cell_index(arg.cell_arg.res, outer_cell),
+        )
+
+    def partition_side_indices_linear(self, cell_begin: int, cell_end: int, device):
+        return linear_grid_partition_side_indices(
+            self, _linear_partition_side_indices_kernel, cell_begin, cell_end, device
+        )
+
+
+@wp.kernel
+def _linear_partition_side_indices_kernel(
+    args: Grid3D.SideArg,
+    cell_begin: int,
+    cell_end: int,
+    partition_side_indices: wp.array(dtype=int),
+    boundary_side_indices: wp.array(dtype=int),
+    frontier_side_indices: wp.array(dtype=int),
+):
+    i = wp.tid()
+    cell_index = cell_begin + i
+
+    res = args.cell_arg.res
+    strides = vec3i(res[1] * res[2], res[2], 1)
+    cell = Grid3D.get_cell(res, cell_index)
+
+    # Output offsets for this cell, in closed form
+    partition_offset = 3 * i
+    boundary_offset = int(0)
+    frontier_offset = int(0)
+    for axis in range(3):
+        side_counts = _linear_grid_partition_side_counts(cell_begin, cell_end, cell_index, strides[axis], res[axis])
+        partition_offset += side_counts[0]
+        boundary_offset += side_counts[1]
+        frontier_offset += side_counts[2]
+
+    for axis in range(3):
+        local_origin = Grid3D._world_to_local(axis, cell)
+        lower_side = Grid3D.side_index(args, Grid3D.Side(axis, local_origin))
+        upper_side = Grid3D.side_index(
+            args, Grid3D.Side(axis, vec3i(local_origin[0] + 1, local_origin[1], local_origin[2]))
+        )
+
+        if cell[axis] == 0:
+            # Lower grid boundary; side is owned by this cell
+            partition_side_indices[partition_offset] = lower_side
+            boundary_side_indices[boundary_offset] = lower_side
+            partition_offset += 1
+            boundary_offset += 1
+        elif cell_index - strides[axis] < cell_begin:
+            # Lower neighbor belongs to another partition
+            frontier_side_indices[frontier_offset] = lower_side
+            frontier_offset += 1
+
+        partition_side_indices[partition_offset] = upper_side
+        partition_offset += 1
+
+        if cell[axis] == res[axis] - 1:
+            # Upper grid boundary
+            boundary_side_indices[boundary_offset] = upper_side
+            boundary_offset += 1
+        elif cell_index + strides[axis] >= cell_end:
+            # Upper neighbor belongs to another partition
+            frontier_side_indices[frontier_offset] = upper_side
+            frontier_offset += 1
@@ -0,0 +1,99 @@
+import warp as wp
+
+from warp.fem.types import vec3i
+
+
+@wp.func
+def _grid_axis_coord_prefix_count(n: int, stride: int, res: int, coord: int):
+    """Number of regular grid cell indices in [0, n) with given coordinate along the axis of given stride"""
+    period = stride * res
+    period_count = n // period
+    remainder = n - period_count * period - coord * stride
+    if remainder < 0:
+        remainder = 0
+    if remainder > stride:
+        remainder = stride
+    return period_count * stride + remainder
+
+
+@wp.func
+def _grid_axis_coord_count(begin: int, end: int, stride: int, res: int, coord: int):
+    """Number of regular grid cell indices in [begin, end) with given coordinate along the axis of given stride"""
+    return _grid_axis_coord_prefix_count(end, stride, res, coord) - _grid_axis_coord_prefix_count(
+        begin, stride, res, coord
+    )
+
+
+@wp.func
+def _linear_grid_partition_side_counts(cell_begin: int, cell_end: int, cell_index: int, stride: int, res: int):
+    """
+    For the cells in [cell_begin, cell_index) of a regular grid partition owning cells [cell_begin, cell_end),
+    returns the number of lower-boundary, boundary and frontier sides orthogonal to the axis of given stride.
+    Also callable from Python scope.
+    """
+
+    lower_count = _grid_axis_coord_count(cell_begin, cell_index, stride, res, 0)
+    upper_count = _grid_axis_coord_count(cell_begin, cell_index, stride, res, res - 1)
+
+    # Cells whose upper neighbor is after cell_end, except those on the grid upper boundary
+    upper_frontier_begin = cell_end - stride
+    if upper_frontier_begin < cell_begin:
+        upper_frontier_begin = cell_begin
+    if upper_frontier_begin > cell_index:
+        upper_frontier_begin = cell_index
+    upper_frontier_count = (cell_index - upper_frontier_begin) - _grid_axis_coord_count(
+        upper_frontier_begin, cell_index, stride, res, res - 1
+    )
+
+    # Cells whose lower neighbor is before cell_begin, except those on the grid lower boundary
+    lower_frontier_end = cell_begin + stride
+    if lower_frontier_end > cell_index:
+        lower_frontier_end = cell_index
+    lower_frontier_count = (lower_frontier_end - cell_begin) - _grid_axis_coord_count(
+        cell_begin, lower_frontier_end, stride, res, 0
+    )
+
+    return vec3i(lower_count, lower_count + upper_count, lower_frontier_count + upper_frontier_count)
+
+
+def linear_grid_partition_side_indices(grid, side_indices_kernel: wp.Kernel, cell_begin: int, cell_end: int, device):
+    """Partition, boundary and frontier side indices of a regular grid partition owning cells ``[cell_begin, cell_end)``
+
+    Side counts are evaluated in closed form on the host, then ``side_indices_kernel`` writes the side indices of each partition cell.
+    """
+
+    if cell_end <= cell_begin:
+        # Trailing partitions of an uneven split may not contain any cell
+        empty_side_indices = wp.empty(n=0, dtype=int, device=device)
+        return empty_side_indices, empty_side_indices, empty_side_indices
+
+    partition_side_count = grid.dimension * (cell_end - cell_begin)
+    boundary_side_count = 0
+    frontier_side_count = 0
+    for axis in range(grid.dimension):
+        side_counts = _linear_grid_partition_side_counts(
+            cell_begin, cell_end, cell_end, grid.strides[axis], grid.res[axis]
+        )
+        partition_side_count += side_counts[0]
+        boundary_side_count += side_counts[1]
+        frontier_side_count += side_counts[2]
+
+    partition_side_indices = wp.empty(n=partition_side_count, dtype=int, device=device)
+    boundary_side_indices = wp.empty(n=boundary_side_count, dtype=int, device=device)
+    frontier_side_indices = wp.empty(n=frontier_side_count, dtype=int, device=device)
+
+    wp.launch(
+        kernel=side_indices_kernel,
+        dim=cell_end - cell_begin,
+        inputs=[
+            grid.side_arg_value(device),
+            cell_begin,
+            cell_end,
+            partition_side_indices,
+            boundary_side_indices,
+            frontier_side_indices,
+        ],
+        device=device,
+    )
+
+    return partition_side_indices, boundary_side_indices, frontier_side_indices
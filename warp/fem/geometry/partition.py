@@ -1,15 +1,44 @@
-from typing import Any
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
 
 import warp as wp
 
-from warp.fem.types import ElementIndex, NULL_ELEMENT_INDEX
-from warp.fem.utils import masked_indices
+from warp.fem.types import ElementIndex, NULL_ELEMENT_INDEX, vec2i
+from warp.fem.utils import masked_indices, masked_row_indices, compress_node_indices
 
 from .geometry import Geometry
 
 
 wp.set_module_options({"enable_backward": False})
 
+# Bits of the packed side flags computed by CellBasedGeometryPartition
+_PARTITION_SIDE_BIT = wp.constant(0)
+_BOUNDARY_SIDE_BIT = wp.constant(1)
+_FRONTIER_SIDE_BIT = wp.constant(2)
+_SIDE_KIND_COUNT = wp.constant(3)
+
+
+@wp.func
+def _side_flags(inner_cell_index: int, outer_cell_index: int, inner_in: int, outer_in: int):
+    same_cell = wp.select(inner_cell_index == outer_cell_index, 0, 1)
+
+    # Inner neighbor in partition: partition side
+    # Inner and outer element are the same: boundary side
+    # Exactly one neighbor in partition: frontier side
+    return (
+        (inner_in << _PARTITION_SIDE_BIT)
+        | ((inner_in & same_cell) << _BOUNDARY_SIDE_BIT)
+        | ((inner_in ^ outer_in) << _FRONTIER_SIDE_BIT)
+    )
+
+
+@wp.func
+def _store_side_masks(side_index: int, flags: int, side_masks: wp.array2d(dtype=int)):
+    # Write unpacked flags, used as input for the side index scan
+    for bit in range(side_masks.shape[0]):
+        side_masks[bit, side_index] = (flags >> bit) & 1
+
 
 class GeometryPartition:
 
@@ -82,17 +111,24 @@ class WholeGeometryPartition(GeometryPartition):
         pass
 
     def cell_arg_value(self, device):
-        arg = WholeGeometryPartition.CellArg()
-        return arg
+        # Empty struct, can be shared by all instances and devices
+        return WholeGeometryPartition._CELL_ARG_VALUE
 
     @wp.func
     def _identity_element_index(args: Any, idx: ElementIndex):
+        """Identity index map. Resolved when building kernels, and inlined by the device compiler"""
         return idx
 
 
+WholeGeometryPartition._CELL_ARG_VALUE = WholeGeometryPartition.CellArg()
+
+
 class CellBasedGeometryPartition(GeometryPartition):
     """Geometry partition based on a subset of cells. Interior, boundary and frontier sides are automatically categorized."""
 
+    COMPACT_SIDE_INDEX_THRESHOLD = 1 << 16
+    """Geometries with at most this many sides store partition side indices as 16-bit unsigned integers"""
+
     def __init__(
         self,
         geometry: Geometry,
@@ -100,12 +136,31 @@ class CellBasedGeometryPartition(GeometryPartition):
     ):
         super().__init__(geometry)
 
+        self._side_arg_cache = {}
+        self._cell_arg_cache = {}
+
+        if geometry.side_count() <= CellBasedGeometryPartition.COMPACT_SIDE_INDEX_THRESHOLD:
+            self.SideArg = CellBasedGeometryPartition.CompactSideArg
+
+    @property
+    def name(self) -> str:
+        # Side index width changes the SideArg type, so must be reflected in kernel cache keys
+        if self.SideArg is CellBasedGeometryPartition.CompactSideArg:
+            return f"{super().name}_compact"
+        return super().name
+
     @wp.struct
     class SideArg:
         partition_side_indices: wp.array(dtype=int)
         boundary_side_indices: wp.array(dtype=int)
         frontier_side_indices: wp.array(dtype=int)
 
+    @wp.struct
+    class CompactSideArg:
+        partition_side_indices: wp.array(dtype=wp.uint16)
+        boundary_side_indices: wp.array(dtype=wp.uint16)
+        frontier_side_indices: wp.array(dtype=wp.uint16)
+
     def side_count(self) -> int:
         return self._partition_side_indices.shape[0]
 
@@ -116,12 +171,31 @@ class CellBasedGeometryPartition(GeometryPartition):
         return self._frontier_side_indices.shape[0]
 
     def side_arg_value(self, device):
-        arg = LinearGeometryPartition.SideArg()
-        arg.partition_side_indices = self._partition_side_indices.to(device)
-        arg.boundary_side_indices = self._boundary_side_indices.to(device)
-        arg.frontier_side_indices = self._frontier_side_indices.to(device)
+        # Side indices are immutable once computed, cache per-device arguments
+        device = wp.get_device(device)
+        arg = self._side_arg_cache.get(device)
+        if arg is None:
+            arg = self.SideArg()
+            arg.partition_side_indices = self._partition_side_indices.to(device)
+            arg.boundary_side_indices = self._boundary_side_indices.to(device)
+            arg.frontier_side_indices = self._frontier_side_indices.to(device)
+            self._side_arg_cache[device] = arg
         return arg
 
+    def _set_side_indices(
+        self, partition_side_indices: wp.array, boundary_side_indices: wp.array, frontier_side_indices: wp.array
+    ):
+        """Stores the partition side indices, converted once to 16-bit integers if the partition uses compact side arguments"""
+
+        if self.SideArg is CellBasedGeometryPartition.CompactSideArg:
+            partition_side_indices = _compact_side_indices(partition_side_indices)
+            boundary_side_indices = _compact_side_indices(boundary_side_indices)
+            frontier_side_indices = _compact_side_indices(frontier_side_indices)
+
+        self._partition_side_indices = partition_side_indices
+        self._boundary_side_indices = boundary_side_indices
+        self._frontier_side_indices = frontier_side_indices
+
     @wp.func
     def side_index(args: SideArg, partition_side_index: int):
         """partition side to side index"""
@@ -137,78 +211,114 @@ class CellBasedGeometryPartition(GeometryPartition):
         """Frontier side to side index"""
         return args.frontier_side_indices[frontier_side_index]
 
+    @wp.func
+    def side_index(args: CompactSideArg, partition_side_index: int):
+        """partition side to side index"""
+        return int(args.partition_side_indices[partition_side_index])
+
+    @wp.func
+    def boundary_side_index(args: CompactSideArg, boundary_side_index: int):
+        """Boundary side to side index"""
+        return int(args.boundary_side_indices[boundary_side_index])
+
+    @wp.func
+    def frontier_side_index(args: CompactSideArg, frontier_side_index: int):
+        """Frontier side to side index"""
+        return int(args.frontier_side_indices[frontier_side_index])
+
+    @staticmethod
+    def _count_sides_kernel(geometry_type: type, cell_inclusion_test_func: wp.Function):
+        """Side classification kernel; depends only on the geometry class so it can be shared between instances"""
+
+        from warp.fem import cache
+
+        side_cell_pair = _side_cell_pair_func(geometry_type)
+
+        def count_side_fn(
+            geo_arg: geometry_type.SideArg,
+            cell_arg_value: Any,
+            side_masks: wp.array2d(dtype=int),
+        ):
+            side_index = wp.tid()
+            side_cells = side_cell_pair(geo_arg, side_index)
+            inner_cell_index = side_cells[0]
+            outer_cell_index = side_cells[1]
+
+            inner_in = wp.select(cell_inclusion_test_func(cell_arg_value, inner_cell_index), 0, 1)
+            outer_in = wp.select(cell_inclusion_test_func(cell_arg_value, outer_cell_index), 0, 1)
+
+            flags = _side_flags(inner_cell_index, outer_cell_index, inner_in, outer_in)
+            _store_side_masks(side_index, flags, side_masks)
+
+        return cache.get_kernel(
+            count_side_fn,
+            suffix=f"{geometry_type.__name__}_{cell_inclusion_test_func.key}",
+        )
+
     def compute_side_indices_from_cells(
         self,
         cell_arg_value: Any,
         cell_inclusion_test_func: wp.Function,
         device,
+        needs_frontier: bool = True,
+        stream: wp.Stream = None,
     ):
-        from warp.fem import cache
+        """Classifies geometry sides according to the cells selected by ``cell_inclusion_test_func``
 
-        def count_side_fn(
-            geo_arg: self.geometry.SideArg,
-            cell_arg_value: Any,
-            partition_side_mask: wp.array(dtype=int),
-            boundary_side_mask: wp.array(dtype=int),
-            frontier_side_mask: wp.array(dtype=int),
-        ):
-            side_index = wp.tid()
-            inner_cell_index = self.geometry.side_inner_cell_index(geo_arg, side_index)
-            outer_cell_index = self.geometry.side_outer_cell_index(geo_arg, side_index)
+        Args:
+            cell_arg_value: value of the arguments passed to ``cell_inclusion_test_func``
+            cell_inclusion_test_func: device function returning whether a cell belongs to the partition
+            device: Warp device on which to perform and store computations
+            needs_frontier: whether frontier sides may exist. If ``False``, frontier sides are not scanned for.
+            stream: stream on which to perform computations, which must belong to ``device`` if both are given. If ``None``, the current stream of ``device`` is used.
+        """
 
-            inner_in = cell_inclusion_test_func(cell_arg_value, inner_cell_index)
-            outer_in = cell_inclusion_test_func(cell_arg_value, outer_cell_index)
+        device = _resolve_stream_device(device, stream)
+        count_sides = CellBasedGeometryPartition._count_sides_kernel(type(self.geometry), cell_inclusion_test_func)
+        with _scoped_stream(device, stream):
+            self._compute_side_indices(count_sides, [cell_arg_value], device, needs_frontier)
 
-            if inner_in:
-                # Inner neighbor in partition; count as partition side
-                partition_side_mask[side_index] = 1
+    def _compute_side_indices(self, count_sides: wp.Kernel, cell_inputs: List, device, needs_frontier: bool):
+        """Launches a side classification kernel with the given cell arguments and converts the flags to side indices"""
 
-                # Inner and outer element as the same -- this is a boundary side
-                if inner_cell_index == outer_cell_index:
-                    boundary_side_mask[side_index] = 1
+        # Resolve device once rather than in each allocation and launch
+        device = wp.get_device(device)
+        side_count = self.geometry.side_count()
 
-            if inner_in != outer_in:
-                # Exactly one neighbor in partition; count as frontier side
-                frontier_side_mask[side_index] = 1
+        if side_count == 0:
+            empty_side_indices = wp.empty(n=0, dtype=int, device=device)
+            self._set_side_indices(empty_side_indices, empty_side_indices, empty_side_indices)
+            return
 
-        count_sides = cache.get_kernel(
-            count_side_fn,
-            suffix=f"{self.geometry.name}_{cell_inclusion_test_func.key}",
-        )
+        # Frontier is the highest flag bit, skip it if not needed
+        bit_count = 3 if needs_frontier else 2
 
-        partition_side_mask = wp.zeros(
-            shape=(self.geometry.side_count(),),
-            dtype=int,
-            device=device,
-        )
-        boundary_side_mask = wp.zeros(
-            shape=(self.geometry.side_count(),),
-            dtype=int,
-            device=device,
-        )
-        frontier_side_mask = wp.zeros(
-            shape=(self.geometry.side_count(),),
+        # Masks are written for every side by the classification kernel, no need to zero-initialize
+        side_masks = wp.empty(
+            shape=(bit_count, side_count),
             dtype=int,
             device=device,
         )
 
         wp.launch(
-            dim=partition_side_mask.shape[0],
+            dim=side_count,
             kernel=count_sides,
             inputs=[
                 self.geometry.side_arg_value(device),
-                cell_arg_value,
-                partition_side_mask,
-                boundary_side_mask,
-                frontier_side_mask,
+                *cell_inputs,
+                side_masks,
             ],
             device=device,
         )
 
-        # Convert counts to indices
-        self._partition_side_indices, _ = masked_indices(partition_side_mask)
-        self._boundary_side_indices, _ = masked_indices(boundary_side_mask)
-        self._frontier_side_indices, _ = masked_indices(frontier_side_mask)
+        # Convert masks to indices
+        side_indices = masked_row_indices(side_masks)
+
+        self._set_side_indices(
+            side_indices[_PARTITION_SIDE_BIT],
+            side_indices[_BOUNDARY_SIDE_BIT],
+            side_indices[_FRONTIER_SIDE_BIT] if needs_frontier else wp.empty(n=0, dtype=int, device=device),
+        )
 
 
 class LinearGeometryPartition(CellBasedGeometryPartition):
@@ -218,6 +328,8 @@ class LinearGeometryPartition(CellBasedGeometryPartition):
         partition_rank: int,
         partition_count: int,
         device=None,
+        stream: wp.Stream = None,
+        side_indices: Optional[Tuple[wp.array, wp.array, wp.array]] = None,
     ):
         """Creates a geometry partition by uniformly partionning cell indices
 
@@ -226,20 +338,113 @@ class LinearGeometryPartition(CellBasedGeometryPartition):
             partition_rank: the index of the partition being created
             partition_count: the number of partitions that will be created over the geometry
             device: Warp device on which to perform and store computations
+            stream: stream on which to perform computations, which must belong to ``device`` if both are given. If ``None``, the current stream of ``device`` is used.
+            side_indices: precomputed partition, boundary and frontier side indices. If ``None``, they are computed from the geometry.
         """
         super().__init__(geometry)
 
-        total_cell_count = geometry.cell_count()
+        device = _resolve_stream_device(device, stream)
+        with _scoped_stream(device, stream):
+            self.cell_begin, self.cell_end = _linear_partition_cell_range(
+                geometry.cell_count(), partition_rank, partition_count
+            )
+
+            if side_indices is None:
+                # Closed-form side indices, if provided by geometry
+                side_indices = geometry.partition_side_indices_linear(self.cell_begin, self.cell_end, device)
+
+            if side_indices is not None:
+                self._set_side_indices(*side_indices)
+            else:
+                count_sides = LinearGeometryPartition._count_sides_linear_kernel(type(geometry))
+                self._compute_side_indices(
+                    count_sides,
+                    [self.cell_begin, self.cell_end],
+                    device,
+                    needs_frontier=partition_count > 1,
+                )
+
+    @classmethod
+    def build_all(
+        cls, geometry: Geometry, partition_count: int, device=None, stream: wp.Stream = None
+    ) -> List["LinearGeometryPartition"]:
+        """Creates the ``partition_count`` uniform partitions of a geometry at once
+
+        Sides are classified for all partitions using a single pass over the geometry sides,
+        rather than one pass per partition.
+
+        Args:
+            geometry: the geometry to partition
+            partition_count: the number of partitions to create over the geometry
+            device: Warp device on which to perform and store computations
+            stream: stream on which to perform computations, which must belong to ``device`` if both are given. If ``None``, the current stream of ``device`` is used.
 
-        cells_per_partition = (total_cell_count + partition_count - 1) // partition_count
-        self.cell_begin = cells_per_partition * partition_rank
-        self.cell_end = min(self.cell_begin + cells_per_partition, total_cell_count)
+        Returns:
+            the list of partitions, indexed by partition rank
+        """
 
-        super().compute_side_indices_from_cells(
-            self.cell_arg_value(device),
-            LinearGeometryPartition._cell_inclusion_test,
-            device,
-        )
+        device = _resolve_stream_device(device, stream)
+
+        if partition_count == 1 or _has_closed_form_linear_sides(type(geometry)):
+            # Closed-form side indices do not require a pass over all sides
+            return [
+                cls(geometry, rank, partition_count, device=device, stream=stream) for rank in range(partition_count)
+            ]
+
+        side_count = geometry.side_count()
+
+        # Each side yields up to four (partition, side kind) keys: partition and boundary side for the partition
+        # of its inner cell, and frontier side for the partitions of both its inner and outer cells.
+        # Unused slots are assigned to a trailing discarded key
+        key_count = partition_count * _SIDE_KIND_COUNT
+        with _scoped_stream(device, stream):
+            side_keys = wp.empty(shape=(side_count, 4), dtype=int, device=device)
+
+            if side_count > 0:
+                cell_begin, cell_end = _linear_partition_cell_range(geometry.cell_count(), 0, partition_count)
+                cells_per_partition = cell_end - cell_begin
+                wp.launch(
+                    dim=side_count,
+                    kernel=LinearGeometryPartition._classify_sides_all_kernel(type(geometry)),
+                    inputs=[
+                        geometry.side_arg_value(device),
+                        max(cells_per_partition, 1),
+                        key_count,
+                        side_keys,
+                    ],
+                    device=device,
+                )
+
+            key_offsets, key_side_indices, _, __ = compress_node_indices(key_count + 1, side_keys)
+            key_offsets = key_offsets.numpy()
+
+        partitions = []
+        for rank in range(partition_count):
+            side_indices = []
+            for kind in range(_SIDE_KIND_COUNT):
+                begin = int(key_offsets[rank * _SIDE_KIND_COUNT + kind])
+                end = int(key_offsets[rank * _SIDE_KIND_COUNT + kind + 1])
+                if end > begin:
+                    side_indices.append(key_side_indices[begin:end])
+                else:
+                    side_indices.append(wp.empty(n=0, dtype=int, device=device))
+
+            partitions.append(
+                cls(
+                    geometry,
+                    rank,
+                    partition_count,
+                    device=device,
+                    stream=stream,
+                    side_indices=(
+                        side_indices[_PARTITION_SIDE_BIT],
+                        side_indices[_BOUNDARY_SIDE_BIT],
+                        side_indices[_FRONTIER_SIDE_BIT],
+                    ),
+                )
+            )
+
+        return partitions
 
     def cell_count(self) -> int:
         return self.cell_end - self.cell_begin
@@ -250,9 +455,14 @@ class LinearGeometryPartition(CellBasedGeometryPartition):
         cell_end: int
 
     def cell_arg_value(self, device):
-        arg = LinearGeometryPartition.CellArg()
-        arg.cell_begin = self.cell_begin
-        arg.cell_end = self.cell_end
+        # Cell range is immutable once computed, cache per-device arguments
+        device = wp.get_device(device)
+        arg = self._cell_arg_cache.get(device)
+        if arg is None:
+            arg = LinearGeometryPartition.CellArg()
+            arg.cell_begin = self.cell_begin
+            arg.cell_end = self.cell_end
+            self._cell_arg_cache[device] = arg
         return arg
 
     @wp.func
@@ -262,40 +472,122 @@ class LinearGeometryPartition(CellBasedGeometryPartition):
 
     @wp.func
     def partition_cell_index(args: CellArg, cell_index: int):
-        """Partition cell to cell index"""
-        if cell_index > args.cell_end:
-            return NULL_ELEMENT_INDEX
-
+        """Cell to partition cell index"""
         partition_cell_index = cell_index - args.cell_begin
-        if partition_cell_index < 0:
-            return NULL_ELEMENT_INDEX
-
-        return partition_cell_index
+        in_range = LinearGeometryPartition._cell_inclusion_test(args, cell_index)
+        return wp.select(in_range, NULL_ELEMENT_INDEX, partition_cell_index)
 
     @wp.func
     def _cell_inclusion_test(arg: CellArg, cell_index: int):
         return cell_index >= arg.cell_begin and cell_index < arg.cell_end
 
+    @staticmethod
+    def _count_sides_linear_kernel(geometry_type: type):
+        """Side classification kernel taking the partition cell range as plain integer arguments"""
+
+        from warp.fem import cache
+
+        side_cell_pair = _side_cell_pair_func(geometry_type)
+
+        def count_side_linear_fn(
+            geo_arg: geometry_type.SideArg,
+            cell_begin: int,
+            cell_end: int,
+            side_masks: wp.array2d(dtype=int),
+        ):
+            side_index = wp.tid()
+            side_cells = side_cell_pair(geo_arg, side_index)
+            inner_cell_index = side_cells[0]
+            outer_cell_index = side_cells[1]
+
+            inner_in = wp.select(inner_cell_index >= cell_begin and inner_cell_index < cell_end, 0, 1)
+            outer_in = wp.select(outer_cell_index >= cell_begin and outer_cell_index < cell_end, 0, 1)
+
+            flags = _side_flags(inner_cell_index, outer_cell_index, inner_in, outer_in)
+            _store_side_masks(side_index, flags, side_masks)
+
+        return cache.get_kernel(
+            count_side_linear_fn,
+            suffix=f"{geometry_type.__name__}_linear",
+        )
+
+    @staticmethod
+    def _classify_sides_all_kernel(geometry_type: type):
+        """Kernel writing the (partition, side kind) keys of each side for all uniform partitions at once"""
+
+        from warp.fem import cache
+
+        side_cell_pair = _side_cell_pair_func(geometry_type)
+
+        def classify_sides_all_fn(
+            geo_arg: geometry_type.SideArg,
+            cells_per_partition: int,
+            discarded_key: int,
+            side_keys: wp.array2d(dtype=int),
+        ):
+            side_index = wp.tid()
+            side_cells = side_cell_pair(geo_arg, side_index)
+            inner_cell_index = side_cells[0]
+            outer_cell_index = side_cells[1]
+
+            inner_key = (inner_cell_index // cells_per_partition) * _SIDE_KIND_COUNT
+            outer_key = (outer_cell_index // cells_per_partition) * _SIDE_KIND_COUNT
+            is_boundary = inner_cell_index == outer_cell_index
+            is_frontier = inner_key != outer_key
+
+            side_keys[side_index, 0] = inner_key + _PARTITION_SIDE_BIT
+            side_keys[side_index, 1] = wp.select(is_boundary, discarded_key, inner_key + _BOUNDARY_SIDE_BIT)
+            side_keys[side_index, 2] = wp.select(is_frontier, discarded_key, inner_key + _FRONTIER_SIDE_BIT)
+            side_keys[side_index, 3] = wp.select(is_frontier, discarded_key, outer_key + _FRONTIER_SIDE_BIT)
+
+        return cache.get_kernel(
+            classify_sides_all_fn,
+            suffix=f"{geometry_type.__name__}_all",
+        )
+
 
 class ExplicitGeometryPartition(CellBasedGeometryPartition):
-    def __init__(self, geometry: Geometry, cell_mask: "wp.array(dtype=int)"):
+    SPARSE_DENSITY_THRESHOLD = 0.25
+    """Maximum ratio of selected cells for which a sparse cell index map is used by default"""
+
+    def __init__(
+        self, geometry: Geometry, cell_mask: "wp.array(dtype=int)", sparse: bool = None, stream: wp.Stream = None
+    ):
         """Creates a geometry partition by uniformly partionning cell indices
 
         Args:
             geometry: the geometry to partition
             cell_mask: warp array of length ``geometry.cell_count()`` indicating which cells are selected. Array values must be either ``1`` (selected) or ``0`` (not selected).
+            sparse: whether to map cell indices to partition cell indices using a hash table rather than a dense array of length ``geometry.cell_count()``.
+              If ``None``, a hash table is used when at most ``SPARSE_DENSITY_THRESHOLD`` of the cells are selected.
+            stream: stream on which to perform computations, which must belong to the ``cell_mask`` device. If ``None``, the current stream of that device is used.
         """
 
         super().__init__(geometry)
 
         self._cell_mask = cell_mask
-        self._cells, self._partition_cells = masked_indices(self._cell_mask)
 
-        super().compute_side_indices_from_cells(
-            self._cell_mask,
-            ExplicitGeometryPartition._cell_inclusion_test,
-            self._cell_mask.device,
-        )
+        device = _resolve_stream_device(cell_mask.device, stream)
+        with _scoped_stream(device, stream):
+            self._cells, self._partition_cells = masked_indices(self._cell_mask)
+
+            if sparse is None:
+                sparse = self.cell_count() <= ExplicitGeometryPartition.SPARSE_DENSITY_THRESHOLD * geometry.cell_count()
+
+            if sparse:
+                self._partition_cells = None
+                self._cell_hash_keys, self._cell_hash_values = ExplicitGeometryPartition._build_cell_hash_table(
+                    self._cells
+                )
+            else:
+                self._cell_hash_keys = None
+                self._cell_hash_values = None
+
+            super().compute_side_indices_from_cells(
+                self._cell_mask,
+                ExplicitGeometryPartition._cell_inclusion_test,
+                device,
+            )
 
     def cell_count(self) -> int:
         return self._cells.shape[0]
@@ -304,11 +596,22 @@ class ExplicitGeometryPartition(CellBasedGeometryPartition):
     class CellArg:
         cell_index: wp.array(dtype=int)
         partition_cell_index: wp.array(dtype=int)
+        cell_hash_keys: wp.array(dtype=int)
+        cell_hash_values: wp.array(dtype=int)
 
     def cell_arg_value(self, device):
-        arg = ExplicitGeometryPartition.CellArg()
-        arg.cell_index = self._cells.to(device)
-        arg.partition_cell_index = self._partition_cells.to(device)
+        # Cell maps are immutable once computed, cache per-device arguments
+        device = wp.get_device(device)
+        arg = self._cell_arg_cache.get(device)
+        if arg is None:
+            arg = ExplicitGeometryPartition.CellArg()
+            arg.cell_index = self._cells.to(device)
+            if self._partition_cells is None:
+                arg.cell_hash_keys = self._cell_hash_keys.to(device)
+                arg.cell_hash_values = self._cell_hash_values.to(device)
+            else:
+                arg.partition_cell_index = self._partition_cells.to(device)
+            self._cell_arg_cache[device] = arg
         return arg
 
     @wp.func
@@ -317,8 +620,178 @@ class ExplicitGeometryPartition(CellBasedGeometryPartition):
 
     @wp.func
     def partition_cell_index(args: CellArg, cell_index: int):
-        return args.partition_cell_index[cell_index]
+        if args.partition_cell_index.shape[0] > 0:
+            return args.partition_cell_index[cell_index]
+
+        # Sparse map, linear probing
+        table_mask = args.cell_hash_keys.shape[0] - 1
+        slot = _hash_cell_index(cell_index) & table_mask
+        key = args.cell_hash_keys[slot]
+        while key != cell_index and key != NULL_ELEMENT_INDEX:
+            slot = (slot + 1) & table_mask
+            key = args.cell_hash_keys[slot]
+
+        return wp.select(key == cell_index, NULL_ELEMENT_INDEX, args.cell_hash_values[slot])
 
     @wp.func
     def _cell_inclusion_test(mask: wp.array(dtype=int), cell_index: int):
         return mask[cell_index] > 0
+
+    @staticmethod
+    def _build_cell_hash_table(cells: wp.array):
+        """Builds an open-addressing hash table mapping cell indices to partition cell indices, with load factor at most one half"""
+
+        cell_indices = cells.numpy()
+        cell_count = cell_indices.shape[0]
+
+        table_size = 1
+        while table_size < 2 * cell_count:
+            table_size *= 2
+        table_mask = table_size - 1
+
+        keys = np.full(table_size, NULL_ELEMENT_INDEX, dtype=np.int32)
+        values = np.full(table_size, NULL_ELEMENT_INDEX, dtype=np.int32)
+
+        # Insert all cells simultaneously; at each round, cells whose current slot is free and not
+        # claimed by another cell with lower index are inserted, others move on to the next slot
+        slots = _hash_cell_indices_host(cell_indices) & table_mask
+        pending = np.arange(cell_count)
+        while pending.shape[0] > 0:
+            pending_slots = slots[pending]
+            free = keys[pending_slots] == NULL_ELEMENT_INDEX
+            free_slots, first = np.unique(pending_slots[free], return_index=True)
+            inserted = pending[free][first]
+
+            keys[free_slots] = cell_indices[inserted]
+            values[free_slots] = inserted
+
+            pending = np.setdiff1d(pending, inserted, assume_unique=True)
+            slots[pending] = (slots[pending] + 1) & table_mask
+
+        return (
+            wp.array(keys, dtype=int, device=cells.device),
+            wp.array(values, dtype=int, device=cells.device),
+        )
+
+
+@wp.func
+def _hash_cell_index(cell_index: int):
+    # Integer finalizer from the 'hash32' family; must match _hash_cell_indices_host
+    h = wp.uint32(cell_index)
+    h = ((h >> wp.uint32(16)) ^ h) * wp.uint32(0x45D9F3B)
+    h = ((h >> wp.uint32(16)) ^ h) * wp.uint32(0x45D9F3B)
+    h = (h >> wp.uint32(16)) ^ h
+    return int(h & wp.uint32(0x7FFFFFFF))
+
+
+def _hash_cell_indices_host(cell_indices: np.ndarray):
+    h = cell_indices.astype(np.uint32)
+    h = ((h >> np.uint32(16)) ^ h) * np.uint32(0x45D9F3B)
+    h = ((h >> np.uint32(16)) ^ h) * np.uint32(0x45D9F3B)
+    h = (h >> np.uint32(16)) ^ h
+    return (h & np.uint32(0x7FFFFFFF)).astype(np.int64)
+
+
+def _resolve_stream_device(device, stream: wp.Stream):
+    """Device on which to perform computations, which must be that of ``stream`` if provided"""
+
+    if stream is None:
+        return wp.get_device(device)
+
+    if device is not None and wp.get_device(device) != stream.device:
+        raise ValueError(f"Stream device '{stream.device}' does not match requested device '{wp.get_device(device)}'")
+
+    return stream.device
+
+
+def _scoped_stream(device, stream: wp.Stream):
+    """Scope making ``stream`` current if provided, or ``device`` and its current stream otherwise"""
+
+    if stream is None:
+        return wp.ScopedDevice(device)
+    return wp.ScopedStream(stream)
+
+
+def _side_cell_pair_func(geometry_type: type) -> wp.Function:
+    """Device function returning the inner and outer cell indices of a side.
+
+    Falls back to separate inner and outer cell lookups for geometries that do not define ``side_cell_pair``.
+    """
+
+    if isinstance(geometry_type.side_cell_pair, wp.Function):
+        return geometry_type.side_cell_pair
+
+    from warp.fem import cache
+
+    def side_cell_pair(args: geometry_type.SideArg, side_index: ElementIndex):
+        return vec2i(
+            geometry_type.side_inner_cell_index(args, side_index),
+            geometry_type.side_outer_cell_index(args, side_index),
+        )
+
+    return cache.get_func(side_cell_pair, geometry_type.__name__)
+
+
+def _compact_side_indices(side_indices: wp.array) -> wp.array:
+    """Converts side indices to 16-bit unsigned integers"""
+
+    device = side_indices.device
+    compact_indices = wp.empty(shape=side_indices.shape, dtype=wp.uint16, device=device)
+    if side_indices.shape[0] > 0:
+        wp.launch(
+            kernel=_compact_side_indices_kernel,
+            dim=side_indices.shape,
+            inputs=[side_indices, compact_indices],
+            device=device,
+        )
+    return compact_indices
+
+
+@wp.kernel
+def _compact_side_indices_kernel(side_indices: wp.array(dtype=int), compact_indices: wp.array(dtype=wp.uint16)):
+    i = wp.tid()
+    compact_indices[i] = wp.uint16(side_indices[i])
+
+
+def _linear_partition_cell_range(cell_count: int, partition_rank: int, partition_count: int):
+    """Range of cells assigned to a partition when uniformly partitioning cell indices"""
+
+    cells_per_partition = (cell_count + partition_count - 1) // partition_count
+    cell_begin = cells_per_partition * partition_rank
+    cell_end = min(cell_begin + cells_per_partition, cell_count)
+    return cell_begin, cell_end
+
+
+def _has_closed_form_linear_sides(geometry_type: type) -> bool:
+    """Whether the geometry type computes the side indices of linear partitions in closed form"""
+    return geometry_type.partition_side_indices_linear is not Geometry.partition_side_indices_linear
+
+
+def warmup_partitions(geometry_types: List[type], device=None):
+    """Builds and loads ahead of time the kernels used for constructing cell-based partitions of the given geometry types
+
+    Registering all kernel specializations before the modules are first loaded avoids having to recompile
+    them when the first partition over a new geometry type is created. Compiled binaries are then persisted in
+    the Warp kernel cache, so subsequent runs do not pay the compilation cost either.
+
+    Args:
+        geometry_types: list of :class:`Geometry` subclasses, e.g. ``[Grid2D, Trimesh2D]``
+        device: Warp device on which to load the kernels. If None, load on all devices.
+    """
+
+    for geometry_type in geometry_types:
+        if not _has_closed_form_linear_sides(geometry_type):
+            LinearGeometryPartition._count_sides_linear_kernel(geometry_type)
+            LinearGeometryPartition._classify_sides_all_kernel(geometry_type)
+
+        count_sides = CellBasedGeometryPartition._count_sides_kernel(
+            geometry_type, ExplicitGeometryPartition._cell_inclusion_test
+        )
+        count_sides.get_overload([geometry_type.SideArg, wp.array(dtype=int), wp.array2d(dtype=int)])
+
+    # Partition construction also launches the index conversion kernels of warp.fem.utils,
+    # and closed-form side index kernels from geometry modules
+    module_names = {__name__, "warp.fem.utils"}
+    module_names.update(geometry_type.__module__ for geometry_type in geometry_types)
+    for module_name in sorted(module_names):
+        wp.load_module(module=module_name, device=device)
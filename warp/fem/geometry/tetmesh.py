@@ -279,6 +279,10 @@ class Tetmesh(Geometry):
     def side_outer_cell_index(arg: SideArg, side_index: ElementIndex):
         return arg.face_tet_indices[side_index][1]
 
+    @wp.func
+    def side_cell_pair(arg: SideArg, side_index: ElementIndex):
+        return arg.face_tet_indices[side_index]
+
     def _build_topology(self):
         from warp.fem.utils import compress_node_indices, masked_indices, _get_pinned_temp_count_buffer
         from warp.utils import array_scan
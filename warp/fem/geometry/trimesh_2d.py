@@ -209,6 +209,10 @@ class Trimesh2D(Geometry):
     def side_outer_cell_index(arg: SideArg, side_index: ElementIndex):
         return arg.edge_tri_indices[side_index][1]
 
+    @wp.func
+    def side_cell_pair(arg: SideArg, side_index: ElementIndex):
+        return arg.edge_tri_indices[side_index]
+
     @wp.func
     def edge_to_tri_coords(args: SideArg, side_index: ElementIndex, tri_index: ElementIndex, side_coords: Coords):
         edge_vidx = args.edge_vertex_indices[side_index]
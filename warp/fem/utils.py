@@ -1,4 +1,4 @@
-from typing import Any, Tuple
+from typing import Any, List, Tuple
 
 import warp as wp
 from warp.utils import radix_sort_pairs, runlength_encode, array_scan
@@ -128,10 +128,10 @@ def compress_node_indices(
 _pinned_temp_count_buffer = {}
 
 
-def _get_pinned_temp_count_buffer(device):
+def _get_pinned_temp_count_buffer(device, count: int = 1):
     device = str(device)
-    if device not in _pinned_temp_count_buffer:
-        _pinned_temp_count_buffer[device] = wp.empty(shape=(1,), dtype=int, pinned=True, device="cpu")
+    if device not in _pinned_temp_count_buffer or _pinned_temp_count_buffer[device].shape[0] < count:
+        _pinned_temp_count_buffer[device] = wp.empty(shape=(count,), dtype=int, pinned=True, device="cpu")
 
     return _pinned_temp_count_buffer[device]
 
@@ -169,6 +169,67 @@ def masked_indices(mask: wp.array(dtype=int), missing_index=-1) -> Tuple[wp.arra
     return indices, offsets
 
 
+def masked_row_indices(masks: wp.array2d(dtype=int)) -> List[wp.array]:
+    """
+    From a 2D array of boolean masks (must be either 0 or 1), returns for each row the list of column indices for which the mask is 1.
+
+    All rows are processed using a single scan and a single host synchronization. The ``masks`` array is overwritten by the scan.
+    """
+
+    device = masks.device
+    row_count, mask_count = masks.shape
+
+    if mask_count == 0:
+        return [wp.empty(n=0, device=device, dtype=int) for _ in range(row_count)]
+
+    # A single inclusive scan over the contiguous rows yields
+    # the location of each selected index in the concatenated list of indices
+    offsets = masks
+
+    # Device scan runs in the current CUDA context
+    with wp.ScopedDevice(device):
+        wp.utils.array_scan(offsets, offsets, inclusive=True)
+
+    # Get back end offsets for each row on host
+    row_ends = wp.empty(n=row_count, dtype=int, device=device)
+    wp.launch(
+        kernel=_gather_row_ends_kernel,
+        dim=row_count,
+        inputs=[offsets, row_ends],
+        device=device,
+    )
+
+    if device.is_cuda:
+        host_row_ends = _get_pinned_temp_count_buffer(device, row_count)
+        wp.copy(dest=host_row_ends, src=row_ends, count=row_count)
+        wp.synchronize_stream(wp.get_stream(device))
+        host_row_ends = host_row_ends.numpy()[:row_count]
+    else:
+        host_row_ends = row_ends.numpy()
+
+    # Convert counts to indices
+    indices = wp.empty(n=int(host_row_ends[-1]), device=device, dtype=int)
+
+    wp.launch(
+        kernel=_scatter_row_indices_kernel,
+        dim=mask_count,
+        inputs=[offsets, indices],
+        device=device,
+    )
+
+    row_indices = []
+    begin = 0
+    for end in host_row_ends:
+        end = int(end)
+        if end > begin:
+            row_indices.append(indices[begin:end])
+        else:
+            row_indices.append(wp.empty(n=0, device=device, dtype=int))
+        begin = end
+
+    return row_indices
+
+
 def array_axpy(x: wp.array, y: wp.array, alpha: float = 1.0, beta: float = 1.0):
     """Performs y = alpha*x + beta*y"""
 
@@ -206,14 +267,42 @@ def _masked_indices_kernel(
 ):
     i = wp.tid()
 
-    if mask[i] == 0:
-        global_to_masked[i] = missing_index
-    else:
-        masked_idx = offsets[i] - 1
-        global_to_masked[i] = masked_idx
+    # Read offset before it gets overwritten, as offsets and global_to_masked may alias
+    selected = mask[i] != 0
+    masked_idx = offsets[i] - 1
+    global_to_masked[i] = wp.select(selected, missing_index, masked_idx)
+
+    if selected:
         masked_to_global[masked_idx] = i
 
 
+@wp.kernel
+def _gather_row_ends_kernel(offsets: wp.array2d(dtype=int), ends: wp.array(dtype=int)):
+    row = wp.tid()
+    ends[row] = offsets[row, offsets.shape[1] - 1]
+
+
+@wp.kernel
+def _scatter_row_indices_kernel(
+    offsets: wp.array2d(dtype=int),
+    indices: wp.array(dtype=int),
+):
+    i = wp.tid()
+
+    for row in range(offsets.shape[0]):
+        # Offsets are accumulated over consecutive rows,
+        # so the mask was set if the offset differs from that of the previous element
+        prev_offset = int(0)
+        if i > 0:
+            prev_offset = offsets[row, i - 1]
+        elif row > 0:
+            prev_offset = offsets[row - 1, offsets.shape[1] - 1]
+
+        offset = offsets[row, i]
+        if offset != prev_offset:
+            indices[offset - 1] = i
+
+
 @wp.kernel
 def _array_axpy_kernel(x: wp.array(dtype=Any), y: wp.array(dtype=Any), alpha: Any, beta: Any):
     i = wp.tid()
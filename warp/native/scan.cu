@@ -5,6 +5,36 @@
 
 #include <cub/device/device_scan.cuh>
 
+#include <map>
+#include <mutex>
+
+// temporary buffer for scan, reused across calls when stream-ordered allocations are not
+// supported, to avoid allocating and freeing (which synchronizes) device memory on every scan
+struct ScanTemp
+{
+    void* mem = NULL;
+    size_t size = 0;
+
+    // recorded after each scan using the buffer, so that scans on other streams wait for it
+    cudaEvent_t last_use = NULL;
+};
+
+// map temp buffers to CUDA contexts
+static std::map<void*, ScanTemp> g_scan_temp_map;
+static std::mutex g_scan_temp_mutex;
+
+
+template<typename T>
+static void scan_device_with_temp(void* temp_buffer, size_t temp_size, const T* values_in, T* values_out, int n, bool inclusive, cudaStream_t stream)
+{
+    if (inclusive) {
+        check_cuda(cub::DeviceScan::InclusiveSum(temp_buffer, temp_size, values_in, values_out, n, stream));
+    } else {
+        check_cuda(cub::DeviceScan::ExclusiveSum(temp_buffer, temp_size, values_in, values_out, n, stream));
+    }
+}
+
+
 template<typename T>
 void scan_device(const T* values_in, T* values_out, int n, bool inclusive)
 {
@@ -20,16 +50,40 @@ void scan_device(const T* values_in, T* values_out, int n, bool inclusive)
         check_cuda(cub::DeviceScan::ExclusiveSum(NULL, scan_temp_size, values_in, values_out, n));
     }
 
-    void* temp_buffer = alloc_temp_device(WP_CURRENT_CONTEXT, scan_temp_size);
+    if (cuda_context_is_memory_pool_supported(WP_CURRENT_CONTEXT))
+    {
+        void* temp_buffer = alloc_temp_device(WP_CURRENT_CONTEXT, scan_temp_size);
 
-    // scan
-    if (inclusive) {
-        check_cuda(cub::DeviceScan::InclusiveSum(temp_buffer, scan_temp_size, values_in, values_out, n, stream));
-    } else {
-        check_cuda(cub::DeviceScan::ExclusiveSum(temp_buffer, scan_temp_size, values_in, values_out, n, stream));
+        scan_device_with_temp(temp_buffer, scan_temp_size, values_in, values_out, n, inclusive, stream);
+
+        free_temp_device(WP_CURRENT_CONTEXT, temp_buffer);
     }
+    else
+    {
+        std::lock_guard<std::mutex> lock(g_scan_temp_mutex);
 
-    free_temp_device(WP_CURRENT_CONTEXT, temp_buffer);
+        ScanTemp& temp = g_scan_temp_map[WP_CURRENT_CONTEXT];
+
+        if (!temp.last_use)
+            check_cuda(cudaEventCreateWithFlags(&temp.last_use, cudaEventDisableTiming));
+
+        if (scan_temp_size > temp.size)
+        {
+            // freeing synchronizes the device, so previous scans using the buffer are done
+            free_device(WP_CURRENT_CONTEXT, temp.mem);
+            temp.mem = alloc_device(WP_CURRENT_CONTEXT, scan_temp_size);
+            temp.size = scan_temp_size;
+        }
+        else
+        {
+            // the previous scan using the buffer may have been issued on another stream
+            check_cuda(cudaStreamWaitEvent(stream, temp.last_use, 0));
+        }
+
+        scan_device_with_temp(temp.mem, scan_temp_size, values_in, values_out, n, inclusive, stream);
+
+        check_cuda(cudaEventRecord(temp.last_use, stream));
+    }
 }
 
 template void scan_device(const int*, int*, int, bool);
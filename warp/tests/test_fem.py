@@ -11,7 +11,9 @@ from warp.tests.test_base import *
 
 
 from warp.fem.types import *
-from warp.fem.geometry import Grid2D, Trimesh2D, Tetmesh
+from warp.fem.geometry import Geometry, Grid2D, Grid3D, Trimesh2D, Tetmesh
+from warp.fem.geometry import LinearGeometryPartition, ExplicitGeometryPartition, warmup_partitions
+from warp.fem.geometry.partition import CellBasedGeometryPartition
 from warp.fem.geometry.closest_point import project_on_tri_at_origin, project_on_tet_at_origin
 from warp.fem.space import make_polynomial_space, SymmetricTensorMapper
 from warp.fem.field import make_test
@@ -20,6 +22,7 @@ from warp.fem.integrate import integrate
 from warp.fem.operator import integrand
 from warp.fem.quadrature import RegularQuadrature
 from warp.fem.utils import unit_element
+from warp.fem import cache
 
 wp.init()
 
@@ -285,6 +288,231 @@ def test_closest_point_queries(test_case, device):
     assert_np_equal(sq_dist.numpy(), expected_sq_dist, tol = 1.e-4)
 
 
+@wp.kernel
+def _linear_partition_cell_index_kernel(
+    cell_arg: LinearGeometryPartition.CellArg, partition_cell_indices: wp.array(dtype=int)
+):
+    i = wp.tid()
+    partition_cell_indices[i] = LinearGeometryPartition.partition_cell_index(cell_arg, i)
+
+
+@wp.kernel
+def _explicit_partition_cell_index_kernel(
+    cell_arg: ExplicitGeometryPartition.CellArg, partition_cell_indices: wp.array(dtype=int)
+):
+    i = wp.tid()
+    partition_cell_indices[i] = ExplicitGeometryPartition.partition_cell_index(cell_arg, i)
+
+
+class _TrimeshWithoutSideCellPair(Trimesh2D):
+    # Geometry relying on separate inner and outer side cell lookups
+    side_cell_pair = Geometry.side_cell_pair
+
+
+def _partition_side_index_kernel(partition):
+    # Kernel cached by partition name, like those generated by warp.fem
+    def partition_side_index_fn(side_arg: partition.SideArg, side_indices: wp.array(dtype=int)):
+        i = wp.tid()
+        side_indices[i] = partition.side_index(side_arg, i)
+
+    return cache.get_kernel(partition_side_index_fn, suffix=partition.name)
+
+
+class _TaggedLinearPartition(LinearGeometryPartition):
+    # Partition subclass with additional state set at construction
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tag = self.cell_begin
+
+
+def _assert_same_partition_sides(partition, reference):
+    # Side indices may be listed in a different order
+    for side_indices in ("_partition_side_indices", "_boundary_side_indices", "_frontier_side_indices"):
+        assert_np_equal(
+            np.sort(getattr(partition, side_indices).numpy()), np.sort(getattr(reference, side_indices).numpy())
+        )
+
+
+def test_geometry_partitions(test_case, device):
+    N = 4
+
+    with wp.ScopedDevice(device):
+        geo = Grid2D(res=vec2i(N))
+
+        partitions = [LinearGeometryPartition(geo, partition_rank=k, partition_count=2) for k in range(2)]
+
+        for partition in partitions:
+            test_case.assertEqual(partition.cell_count(), N * N // 2)
+            test_case.assertEqual(partition.boundary_side_count(), 2 * N)
+            test_case.assertEqual(partition.frontier_side_count(), N)
+
+        test_case.assertEqual(partitions[0].side_count(), 22)
+        test_case.assertEqual(partitions[1].side_count(), 18)
+
+        # Cell indices outside of the partition, including cell_end, should not be mapped
+        partition_cells = wp.empty(geo.cell_count(), dtype=int)
+        wp.launch(
+            _linear_partition_cell_index_kernel,
+            dim=geo.cell_count(),
+            inputs=[partitions[0].cell_arg_value(device), partition_cells],
+        )
+        expected_partition_cells = np.arange(geo.cell_count())
+        expected_partition_cells[N * N // 2 :] = -1
+        assert_np_equal(partition_cells.numpy(), expected_partition_cells)
+
+        # Each side should be owned by exactly one partition
+        partition_sides = np.concatenate([p._partition_side_indices.numpy() for p in partitions])
+        assert_np_equal(np.sort(partition_sides), np.arange(geo.side_count()))
+
+        # Small geometries store side indices as 16-bit integers
+        test_case.assertIs(partitions[0].SideArg, CellBasedGeometryPartition.CompactSideArg)
+        test_case.assertEqual(partitions[0]._partition_side_indices.dtype, wp.uint16)
+        side_arg = partitions[0].side_arg_value(device)
+        assert_np_equal(side_arg.partition_side_indices.numpy(), partitions[0]._partition_side_indices.numpy())
+        assert_np_equal(side_arg.frontier_side_indices.numpy(), partitions[0]._frontier_side_indices.numpy())
+
+        # Explicit partition with the same cells as the first linear partition
+        cell_mask = wp.array((np.arange(geo.cell_count()) < N * N // 2).astype(int), dtype=int)
+        explicit = ExplicitGeometryPartition(geo, cell_mask)
+
+        test_case.assertEqual(explicit.cell_count(), partitions[0].cell_count())
+        _assert_same_partition_sides(explicit, partitions[0])
+
+        # Dense and sparse cell index maps
+        cell_mask_np = np.zeros(geo.cell_count(), dtype=int)
+        cell_mask_np[[1, 5, 6, 11]] = 1
+        expected_partition_cells = np.where(cell_mask_np, np.cumsum(cell_mask_np) - 1, -1)
+
+        for sparse in (False, True):
+            explicit = ExplicitGeometryPartition(geo, wp.array(cell_mask_np, dtype=int), sparse=sparse)
+            partition_cells = wp.empty(geo.cell_count(), dtype=int)
+            wp.launch(
+                _explicit_partition_cell_index_kernel,
+                dim=geo.cell_count(),
+                inputs=[explicit.cell_arg_value(device), partition_cells],
+            )
+            assert_np_equal(partition_cells.numpy(), expected_partition_cells)
+
+        # Partitions with 16-bit and 32-bit side indices should not share kernels
+        for res in (N, 200):
+            geo = Grid2D(res=vec2i(res))
+            partition = LinearGeometryPartition(geo, partition_rank=0, partition_count=2)
+            side_indices = wp.empty(partition.side_count(), dtype=int)
+            wp.launch(
+                _partition_side_index_kernel(partition),
+                dim=partition.side_count(),
+                inputs=[partition.side_arg_value(device), side_indices],
+            )
+            assert_np_equal(side_indices.numpy(), partition._partition_side_indices.numpy())
+
+        # Uneven split, trailing partitions do not contain any cell
+        geo = Grid2D(res=vec2i(10))
+        partitions = [LinearGeometryPartition(geo, partition_rank=k, partition_count=30) for k in range(30)]
+        for partition in partitions[25:]:
+            test_case.assertEqual(partition.side_count(), 0)
+            test_case.assertEqual(partition.boundary_side_count(), 0)
+            test_case.assertEqual(partition.frontier_side_count(), 0)
+
+        partition_sides = np.concatenate([p._partition_side_indices.numpy() for p in partitions])
+        assert_np_equal(np.sort(partition_sides), np.arange(geo.side_count()))
+
+        # Closed-form grid side indices should match those of the generic cell-based classification
+        geo = Grid3D(res=vec3i(N))
+        cell_indices = np.arange(geo.cell_count())
+        for rank in range(3):
+            linear = LinearGeometryPartition(geo, partition_rank=rank, partition_count=3)
+
+            cell_mask = (cell_indices >= linear.cell_begin) & (cell_indices < linear.cell_end)
+            explicit = ExplicitGeometryPartition(geo, wp.array(cell_mask.astype(int), dtype=int))
+
+            _assert_same_partition_sides(explicit, linear)
+
+        # Batched construction of all linear partitions should match individual construction
+        positions, tri_vidx = _gen_trimesh(N)
+        geo = Trimesh2D(tri_vertex_indices=tri_vidx, positions=positions)
+        batched = LinearGeometryPartition.build_all(geo, partition_count=3)
+        test_case.assertEqual(len(batched), 3)
+        for rank, partition in enumerate(batched):
+            linear = LinearGeometryPartition(geo, partition_rank=rank, partition_count=3)
+            test_case.assertEqual(partition.cell_begin, linear.cell_begin)
+            test_case.assertEqual(partition.cell_end, linear.cell_end)
+
+            _assert_same_partition_sides(partition, linear)
+
+        # Single partition owns all sides, and has no frontier
+        single = LinearGeometryPartition(geo, partition_rank=0, partition_count=1)
+        test_case.assertEqual(single.side_count(), geo.side_count())
+        test_case.assertEqual(single.boundary_side_count(), geo.boundary_side_count())
+        test_case.assertEqual(single.frontier_side_count(), 0)
+        assert_np_equal(np.sort(single._partition_side_indices.numpy()), np.arange(geo.side_count()))
+
+        # Batched construction should go through subclass constructors
+        tagged = _TaggedLinearPartition.build_all(geo, partition_count=3)
+        for rank, partition in enumerate(tagged):
+            test_case.assertIsInstance(partition, _TaggedLinearPartition)
+            test_case.assertEqual(partition.tag, batched[rank].cell_begin)
+            _assert_same_partition_sides(partition, batched[rank])
+
+        # Geometries without side_cell_pair should classify sides identically
+        fallback_geo = _TrimeshWithoutSideCellPair(tri_vertex_indices=tri_vidx, positions=positions)
+        for rank in range(3):
+            fallback = LinearGeometryPartition(fallback_geo, partition_rank=rank, partition_count=3)
+            _assert_same_partition_sides(fallback, batched[rank])
+
+        # Construction on a device that is not the current one
+        with wp.ScopedDevice("cpu"):
+            other_device = LinearGeometryPartition(geo, partition_rank=1, partition_count=3, device=device)
+        _assert_same_partition_sides(other_device, batched[1])
+
+        # Construction on a separate stream
+        if wp.get_device(device).is_cuda:
+            stream = wp.Stream(device)
+            streamed = LinearGeometryPartition(geo, partition_rank=1, partition_count=3, stream=stream)
+            wp.synchronize_stream(stream)
+            _assert_same_partition_sides(streamed, batched[1])
+
+            with test_case.assertRaises(ValueError):
+                LinearGeometryPartition(geo, partition_rank=1, partition_count=3, device="cpu", stream=stream)
+
+
+def _loaded_module(module_name, device):
+    module = wp.get_module(module_name)
+    return module.cpu_module if device.is_cpu else module.cuda_modules.get(device.context)
+
+
+def test_warmup_partitions(test_case, device):
+    device = wp.get_device(device)
+    N = 4
+
+    with wp.ScopedDevice(device):
+        warmup_partitions([Grid2D, Trimesh2D], device=device)
+
+        module_names = (
+            "warp.fem.geometry.partition",
+            "warp.fem.utils",
+            "warp.fem.geometry.grid_2d",
+            "warp.fem.geometry.trimesh_2d",
+        )
+        loaded_modules = [_loaded_module(module_name, device) for module_name in module_names]
+        test_case.assertIsNotNone(loaded_modules[0])
+        test_case.assertIsNotNone(loaded_modules[1])
+
+        grid = Grid2D(res=vec2i(N))
+        positions, tri_vidx = _gen_trimesh(N)
+        trimesh = Trimesh2D(tri_vertex_indices=tri_vidx, positions=positions)
+
+        for geo in (grid, trimesh):
+            LinearGeometryPartition(geo, partition_rank=0, partition_count=2)
+            LinearGeometryPartition.build_all(geo, partition_count=2)
+
+            cell_mask = wp.array((np.arange(geo.cell_count()) % 2).astype(int), dtype=int)
+            ExplicitGeometryPartition(geo, cell_mask)
+
+        # Creating the first partitions should not have reloaded any module
+        for module_name, loaded_module in zip(module_names, loaded_modules):
+            test_case.assertEqual(_loaded_module(module_name, device), loaded_module)
+
+
 def test_regular_quadrature(test_case, device):
     from warp.fem.geometry.element import LinearEdge, Triangle, Polynomial
 
@@ -351,6 +579,8 @@ def register(parent):
     add_function_test(TestFem, "test_integrate_gradient", test_integrate_gradient, devices=devices)
     add_function_test(TestFem, "test_triangle_mesh", test_triangle_mesh, devices=devices)
     add_function_test(TestFem, "test_tet_mesh", test_tet_mesh, devices=devices)
+    add_function_test(TestFem, "test_geometry_partitions", test_geometry_partitions, devices=devices)
+    add_function_test(TestFem, "test_warmup_partitions", test_warmup_partitions, devices=devices)
     add_function_test(TestFem, "test_dof_mapper", test_dof_mapper)
 
     return TestFem
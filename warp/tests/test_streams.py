@@ -368,6 +368,28 @@ def test_stream_scope_graph_mgpu(test, device):
     assert_np_equal(c0.numpy(), np.full(N, fill_value=2 * num_iters))
 
 
+def test_stream_scope_array_scan(test, device):
+    # scans issued on different streams may share temporary storage
+
+    values = np.arange(N, dtype=np.int32) % 7
+    a = wp.array(values, dtype=int, device=device)
+
+    streams = [wp.Stream(device) for _ in range(2)]
+    results = [wp.empty_like(a) for _ in streams]
+
+    # alternate between scan sizes, so that storage is both grown and reused
+    for n in (N // 4, N, N // 2):
+        for stream, result in zip(streams, results):
+            with wp.ScopedStream(stream):
+                wp.utils.array_scan(a[:n], result[:n], inclusive=True)
+
+    wp.synchronize_device(device)
+
+    for result in results:
+        assert_np_equal(result.numpy()[: N // 2], np.cumsum(values[: N // 2]))
+        assert_np_equal(result.numpy()[N // 2 :], np.cumsum(values)[N // 2 :])
+
+
 def register(parent):
     devices = wp.get_cuda_devices()
 
@@ -383,6 +405,7 @@ def register(parent):
     add_function_test(TestStreams, "test_stream_scope_synchronize", test_stream_scope_synchronize, devices=devices)
     add_function_test(TestStreams, "test_stream_scope_wait_event", test_stream_scope_wait_event, devices=devices)
     add_function_test(TestStreams, "test_stream_scope_wait_stream", test_stream_scope_wait_stream, devices=devices)
+    add_function_test(TestStreams, "test_stream_scope_array_scan", test_stream_scope_array_scan, devices=devices)
 
     if len(devices) > 1:
         add_function_test(TestStreams, "test_stream_arg_graph_mgpu", test_stream_arg_graph_mgpu)